@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Screen grabbing backends for the stitching capture tools
+The fastest available backend is picked at import: DXcam (DXGI Desktop
+Duplication) on Windows, mss elsewhere, PIL.ImageGrab as the fallback
+"""
+
+import os
+import sys
+import time
+import atexit
+import tempfile
+import numpy as np
+from PIL import Image
+
+# DXcam hands back the compositor's already-composed frame, skipping GDI
+dxcam = None
+if sys.platform == 'win32':
+    try:
+        import dxcam  # pip install dxcam
+    except ImportError:
+        pass
+
+# mss keeps its GDI handles across grabs instead of re-creating a DC and
+# bitmap on every ImageGrab call
+try:
+    import mss  # pip install mss
+except ImportError:
+    mss = None
+
+BACKEND = 'dxcam' if dxcam else 'mss' if mss else 'pil'
+
+# How long (seconds) a DXcam frame may stand in when the camera reports no
+# new frame; past this a region grab is taken instead
+DXCAM_REUSE_TTL = 1.0
+
+# How long (ms) to wait after an overlay is hidden before grabbing: Tk
+# reports the window unmapped before DWM composites a frame without it
+COMPOSITE_DELAY_MS = 40
+
+# Temp files written by spill() and not yet removed, cleaned up at exit
+_spilled = set()
+
+
+def _from_bgra(shot):
+    """Convert an mss screenshot to an RGB image"""
+    # Decode BGRA straight to RGB; mss's .rgb property is a slow Python
+    # loop and .bgra is a bytes() copy of the frame, so read .raw instead.
+    # The decode copies the pixels, so the image stays valid after the shot
+    # is released.
+    return Image.frombuffer('RGB', shot.size, shot.raw, 'raw', 'BGRX', 0, 1)
+
+
+class Grabber:
+    """
+    Grab screen regions as RGB images through the best available backend
+
+    Backend handles are created on first use and belong to the thread that
+    made the first grab; call close() from that same thread.
+    """
+
+    def __init__(self):
+        self._camera = None  # dxcam camera for the primary output
+        self._sct = None  # mss instance
+        self._frame = None  # Last DXcam frame
+        self._frame_time = 0.0
+
+    def grab(self, bbox):
+        """
+        Grab bbox (left, top, right, bottom) as an RGB image
+
+        DXcam always works on full frames of the primary output; regions it
+        doesn't cover, and the other backends, grab just bbox.
+        """
+        if BACKEND == 'dxcam':
+            frame = self._dxcam_frame()
+            if frame is not None and self._covers(bbox):
+                return frame.crop(bbox)
+
+        return self._grab_region(bbox)
+
+    def close(self):
+        """Release backend handles and the cached frame"""
+        self._frame = None
+        if self._camera is not None:
+            self._camera.release()
+            self._camera = None
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def _mss(self):
+        if self._sct is None:
+            self._sct = mss.mss()
+        return self._sct
+
+    def _covers(self, bbox):
+        """Whether bbox lies inside the cached frame"""
+        x1, y1, x2, y2 = bbox
+        return 0 <= x1 and 0 <= y1 and x2 <= self._frame.width and y2 <= self._frame.height
+
+    def _dxcam_frame(self):
+        """Return the current DXcam frame, or None"""
+        if self._camera is None:
+            self._camera = dxcam.create(output_color='RGB')
+        frame = self._camera.grab()
+        if frame is None:
+            # None means no new frame since the last one. Reuse the cached
+            # frame only while it is recent, keeping its original timestamp;
+            # otherwise the caller falls back to a region grab
+            if (self._frame is not None and
+                    time.monotonic() - self._frame_time <= DXCAM_REUSE_TTL):
+                return self._frame
+            return None
+
+        self._frame = Image.fromarray(frame)
+        self._frame_time = time.monotonic()
+        return self._frame
+
+    def _grab_region(self, bbox):
+        """Grab just bbox, without a full-screen frame"""
+        if mss is not None:
+            x1, y1, x2, y2 = bbox
+            return _from_bgra(self._mss().grab({'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1}))
+        from PIL import ImageGrab
+        return ImageGrab.grab(bbox=bbox)
+
+
+def spill(img):
+    """
+    Write a capture to a temporary .npy file so it doesn't stay in RAM
+
+    Returns:
+        (path, (width, height)) tuple
+    """
+    fd, path = tempfile.mkstemp(prefix='screencatch_', suffix='.npy')
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, np.asarray(img))
+    _spilled.add(path)
+    return path, img.size
+
+
+def load_spilled(entries):
+    """Yield the images of spill() entries one at a time, memory-mapped from disk"""
+    for path, _ in entries:
+        arr = np.load(path, mmap_mode='r')
+        img = Image.fromarray(arr)  # Copies the pixels out of the mapping
+        del arr  # Unmap now, so the file can be removed on Windows
+        yield img
+
+
+def write_spilled_png(entry, filepath, level):
+    """
+    Encode a spill() entry straight to PNG with mss.tools, skipping the
+    PIL image and Pillow's PNG encoder
+
+    Returns:
+        False when mss isn't installed and nothing was written
+    """
+    if mss is None:
+        return False
+
+    from mss.tools import to_png
+
+    path, size = entry
+    arr = np.load(path, mmap_mode='r')
+    with memoryview(arr).cast('B') as data:
+        to_png(data, size, level=level, output=filepath)
+    del arr  # Unmap now, so the file can be removed on Windows
+    return True
+
+
+def remove_spilled(entries):
+    """Delete the temp files of spill() entries"""
+    for path, _ in entries:
+        _spilled.discard(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@atexit.register
+def _remove_leftovers():
+    remove_spilled([(path, None) for path in list(_spilled)])
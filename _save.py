@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Saving helpers shared by the stitching capture tools
+Lossless output format choice, PNG/WebP encoding and stitched saves
+"""
+
+import os
+from typing import TYPE_CHECKING
+from PIL import features
+
+if TYPE_CHECKING:
+    from image_stitcher import ImageStitcher
+
+
+def _png_level():
+    """zlib level from $SCREENCATCH_PNG_LEVEL, clamped to 0-9"""
+    try:
+        level = int(os.environ.get('SCREENCATCH_PNG_LEVEL', '1'))
+    except ValueError:
+        return 1  # Unparseable; keep the default rather than fail at import
+    return min(max(level, 0), 9)
+
+
+# zlib level for saved PNGs; screenshots deflate well even at level 1,
+# which is several times faster than Pillow's default of 6
+PNG_LEVEL = _png_level()
+
+# Lossless WebP encodes screenshots smaller than PNG through libwebp's
+# SIMD paths; PNG remains the fallback where Pillow lacks WebP support
+OUTPUT_EXT = 'webp' if features.check('webp') else 'png'
+
+# WebP can't encode images larger than this in either dimension
+WEBP_MAX_SIZE = 16383
+
+
+def save_capture(img, filepath):
+    """
+    Save a capture losslessly in OUTPUT_EXT format
+
+    Returns:
+        Path actually written; tall stitches beyond WebP's size limit are
+        saved as PNG instead
+    """
+    if OUTPUT_EXT == 'webp' and max(img.size) <= WEBP_MAX_SIZE:
+        img.save(filepath, 'WEBP', lossless=True, quality=0, method=0)
+        return filepath
+
+    filepath = os.path.splitext(filepath)[0] + '.png'
+    img.save(filepath, 'PNG', compress_level=PNG_LEVEL, optimize=False)
+    return filepath
+
+
+# image_stitcher is only needed to save a stitch, so it is imported on the
+# first save only
+_stitcher = None
+
+
+def image_stitcher() -> 'type[ImageStitcher]':
+    """Return the ImageStitcher class, importing it once"""
+    global _stitcher
+    if _stitcher is None:
+        from image_stitcher import ImageStitcher
+        _stitcher = ImageStitcher
+    return _stitcher
+
+
+def save_stitched(images, sizes, filepath):
+    """
+    Stitch captures vertically and save them like save_capture
+
+    PNG output is streamed to disk as the captures load, without holding
+    the whole stitch in memory.
+
+    Returns:
+        Path actually written
+    """
+    width = max(w for w, h in sizes)
+    height = sum(h for w, h in sizes)
+    if OUTPUT_EXT == 'webp' and max(width, height) <= WEBP_MAX_SIZE:
+        return save_capture(image_stitcher().stitch_images(images, sizes), filepath)
+
+    filepath = os.path.splitext(filepath)[0] + '.png'
+    image_stitcher().write_vertical_png(images, sizes, filepath, PNG_LEVEL)
+    return filepath
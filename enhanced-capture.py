@@ -6,9 +6,15 @@ Enhanced screen capture with description input and multi-capture support
 import sys
 import json
 import tkinter as tk
-from tkinter import Canvas, simpledialog, messagebox
-from PIL import Image
-import io
+from tkinter import Canvas, simpledialog
+
+# Importing capture opts the process in to per-monitor DPI awareness and
+# resolves the screen metrics once
+from capture import (
+    debug, json_bytes,
+    VIRTUAL_X_MIN, VIRTUAL_Y_MIN, VIRTUAL_WIDTH, VIRTUAL_HEIGHT, PRIMARY_WIDTH,
+)
+
 
 class DescriptionDialog:
     """Simple dialog to get description from user"""
@@ -29,8 +35,9 @@ class DescriptionDialog:
 
 class MultiCaptureOverlay:
     """Enhanced overlay supporting multiple captures in one session"""
-    def __init__(self, output_file):
+    def __init__(self, output_file, description=None):
         self.output_file = output_file
+        self.description = description
         self.captures = []  # List of captured regions
         self.current_capture = 0
 
@@ -40,28 +47,23 @@ class MultiCaptureOverlay:
         self.root.update_idletasks()
 
         # Calculate total screen area covering all monitors
-        try:
-            import ctypes
-            user32 = ctypes.windll.user32
-
-            # Get the virtual screen dimensions
-            x_min = user32.GetSystemMetrics(76)  # SM_XVIRTUALSCREEN
-            y_min = user32.GetSystemMetrics(77)  # SM_YVIRTUALSCREEN
-            x_max = user32.GetSystemMetrics(78)  # SM_CXVIRTUALSCREEN
-            y_max = user32.GetSystemMetrics(79)  # SM_CYVIRTUALSCREEN
-
+        if VIRTUAL_WIDTH is not None:
             # Set window geometry to cover all monitors
-            self.root.geometry(f"{x_max}x{y_max}+{x_min}+{y_min}")
+            self.root.geometry(f"{VIRTUAL_WIDTH}x{VIRTUAL_HEIGHT}+{VIRTUAL_X_MIN}+{VIRTUAL_Y_MIN}")
             self.root.overrideredirect(True)
 
-            self.virtual_x_offset = x_min
-            self.virtual_y_offset = y_min
-        except Exception as e:
-            print(f"Warning: Could not detect multi-monitor setup: {e}", file=sys.stderr)
+            self.virtual_x_offset = VIRTUAL_X_MIN
+            self.virtual_y_offset = VIRTUAL_Y_MIN
+        else:
+            print("Warning: Could not detect multi-monitor setup", file=sys.stderr)
             self.root.attributes('-fullscreen', True)
             self.virtual_x_offset = 0
             self.virtual_y_offset = 0
 
+        # Deliberately a uniform -alpha rather than -transparentcolor: colour-keyed
+        # pixels of a layered window are click-through on Windows, so a keyed
+        # backdrop would send every drag to the desktop underneath. A static
+        # layered window is composited once per change, not per frame.
         self.root.attributes('-alpha', 0.3)
         self.root.attributes('-topmost', True)
         self.root.configure(background='black', cursor='crosshair')
@@ -75,14 +77,13 @@ class MultiCaptureOverlay:
         self.region = None
 
         # Dragging state for instruction box
-        self.drag_data = {'x': 0, 'y': 0, 'item': None}
+        self.drag_data = {'x': 0, 'y': 0, 'item': None, 'origin': (0, 0), 'target': (0, 0), 'pending': None}
         self.is_dragging_instructions = False
 
         # Instructions with background box
-        try:
-            primary_screen_width = user32.GetSystemMetrics(0)  # SM_CXSCREEN
-            center_x = (primary_screen_width // 2) - self.virtual_x_offset
-        except:
+        if PRIMARY_WIDTH is not None:
+            center_x = (PRIMARY_WIDTH // 2) - self.virtual_x_offset
+        else:
             center_x = self.canvas.winfo_screenwidth() // 2
 
         # Create dark background rectangle for instructions
@@ -106,6 +107,15 @@ class MultiCaptureOverlay:
             tags='instructions'
         )
 
+        # Cached so on_press can hit-test with a plain point-in-rect check
+        self.instructions_bbox = self.canvas.bbox('instructions')
+
+        # Selection rectangle is created once and shown/hidden as needed
+        self.selection_rect = self.canvas.create_rectangle(
+            0, 0, 0, 0,
+            outline='#00a8ff', width=2, state='hidden'
+        )
+
         # Bind selection events to canvas first (lower priority)
         self.canvas.bind('<Button-1>', self.on_press)
         self.canvas.bind('<B1-Motion>', self.on_drag)
@@ -131,41 +141,58 @@ class MultiCaptureOverlay:
 
     def on_instructions_press(self, event):
         self.is_dragging_instructions = True
-        self.drag_data['x'] = event.x
-        self.drag_data['y'] = event.y
+        # Remember where the drag started and where the box was, so each
+        # motion event is one absolute moveto() instead of a running delta
+        self.drag_data['x'] = event.x_root
+        self.drag_data['y'] = event.y_root
+        # moveto() places the first 'instructions' item, the background, so
+        # take the origin from that item rather than the union bbox
+        self.drag_data['origin'] = self.canvas.bbox(self.instructions_bg)[:2]
         self.canvas.config(cursor='fleur')
-        return "break"
+        return "break"  # Stop event propagation
 
     def on_instructions_drag(self, event):
         if self.is_dragging_instructions:
-            delta_x = event.x - self.drag_data['x']
-            delta_y = event.y - self.drag_data['y']
-            self.canvas.move('instructions', delta_x, delta_y)
-            self.drag_data['x'] = event.x
-            self.drag_data['y'] = event.y
+            # Coalesce motion events and redraw at most ~60 times a second
+            self.drag_data['target'] = (event.x_root, event.y_root)
+            if self.drag_data['pending'] is None:
+                self.drag_data['pending'] = self.root.after(16, self._apply_instructions_drag)
         return "break"
 
+    def _apply_instructions_drag(self):
+        """Move instruction box to the latest dragged position"""
+        self.drag_data['pending'] = None
+        x_root, y_root = self.drag_data['target']
+        origin_x, origin_y = self.drag_data['origin']
+        self.canvas.moveto(
+            'instructions',
+            origin_x + x_root - self.drag_data['x'],
+            origin_y + y_root - self.drag_data['y']
+        )
+
     def on_instructions_release(self, event):
-        self.is_dragging_instructions = False
-        self.canvas.config(cursor='crosshair')
+        if self.is_dragging_instructions:
+            self.is_dragging_instructions = False
+            # Land exactly where the mouse was released
+            if self.drag_data['pending'] is not None:
+                self.root.after_cancel(self.drag_data['pending'])
+                self._apply_instructions_drag()
+            self.instructions_bbox = self.canvas.bbox('instructions')
+            self.canvas.config(cursor='crosshair')
         return "break"
 
     def on_press(self, event):
         # Check if clicking on instructions
-        items = self.canvas.find_overlapping(event.x, event.y, event.x, event.y)
-        for item in items:
-            if 'instructions' in self.canvas.gettags(item):
-                return
+        x1, y1, x2, y2 = self.instructions_bbox
+        if x1 <= event.x <= x2 and y1 <= event.y <= y2:
+            return
 
         # Start region selection
         self.start_x = event.x
         self.start_y = event.y
-        if self.rect:
-            self.canvas.delete(self.rect)
-        self.rect = self.canvas.create_rectangle(
-            self.start_x, self.start_y, self.start_x, self.start_y,
-            outline='#00a8ff', width=2
-        )
+        self.rect = self.selection_rect
+        self.canvas.coords(self.rect, self.start_x, self.start_y, self.start_x, self.start_y)
+        self.canvas.itemconfig(self.rect, state='normal')
 
     def on_drag(self, event):
         if self.is_dragging_instructions:
@@ -191,20 +218,20 @@ class MultiCaptureOverlay:
                 'height': height
             }
 
-            print(f"Region selected: {width}x{height} at ({canvas_x}, {canvas_y})", file=sys.stderr)
+            debug(f"Region selected: {width}x{height} at ({canvas_x}, {canvas_y})")
 
     def on_capture_continue(self, event=None):
         """Capture current region and continue"""
         if self._save_current_region():
             # Clear for next capture
             if self.rect:
-                self.canvas.delete(self.rect)
+                self.canvas.itemconfig(self.rect, state='hidden')
                 self.rect = None
             self.region = None
             self.start_x = None
             self.start_y = None
             self.update_instructions()
-            print(f"Region {len(self.captures)} captured! Select another region or press ESC when done.", file=sys.stderr)
+            debug(f"Region {len(self.captures)} captured! Select another region or press ESC when done.")
 
     def on_capture(self, event=None):
         """Capture current region and finish"""
@@ -227,22 +254,26 @@ class MultiCaptureOverlay:
             print(f"Region too small ({self.region['width']}x{self.region['height']}). Please select a larger area.", file=sys.stderr)
             return False
 
-        print(f"Saving region: {self.region['width']}x{self.region['height']} at ({self.region['x']}, {self.region['y']})", file=sys.stderr)
+        debug(f"Saving region: {self.region['width']}x{self.region['height']} at ({self.region['x']}, {self.region['y']})")
         self.captures.append(self.region.copy())
         return True
 
     def on_finish(self, event=None):
         """Finish capturing and save results"""
-        print(f"Finishing with {len(self.captures)} capture(s)", file=sys.stderr)
+        debug(f"Finishing with {len(self.captures)} capture(s)")
+
+        result = {
+            'captures': self.captures,
+            'count': len(self.captures),
+            'cancelled': len(self.captures) == 0,
+            'show_preview': True  # Flag to show preview after merge
+        }
+        if self.description:
+            result['description'] = self.description
 
         # Write all captures to output file
-        with open(self.output_file, 'w') as f:
-            json.dump({
-                'captures': self.captures,
-                'count': len(self.captures),
-                'cancelled': len(self.captures) == 0,
-                'show_preview': True  # Flag to show preview after merge
-            }, f)
+        with open(self.output_file, 'wb') as f:
+            f.write(json_bytes(result))
 
         self.root.destroy()
 
@@ -269,19 +300,11 @@ def main():
                 json.dump({'cancelled': True, 'reason': 'no_description'}, f)
             sys.exit(0)
 
-        print(f"Description: {description}", file=sys.stderr)
+        debug(f"Description: {description}")
 
-    # Run the multi-capture overlay
-    app = MultiCaptureOverlay(output_file)
+    # Run the multi-capture overlay (writes the description with the captures)
+    app = MultiCaptureOverlay(output_file, description)
     app.run()
 
-    # If description was provided, add it to the output
-    if with_description and description:
-        with open(output_file, 'r') as f:
-            data = json.load(f)
-        data['description'] = description
-        with open(output_file, 'w') as f:
-            json.dump(data, f)
-
 if __name__ == '__main__':
     main()
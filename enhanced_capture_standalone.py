@@ -5,10 +5,23 @@ Refactored from enhanced-capture.py for standalone CLI
 """
 
 import sys
-import json
+import threading
 import tkinter as tk
 from tkinter import simpledialog
-import ctypes
+from tkinter import font as tkfont
+
+from capture import (
+    VIRTUAL_X_MIN,
+    VIRTUAL_Y_MIN,
+    VIRTUAL_WIDTH,
+    VIRTUAL_HEIGHT,
+    debug,
+    json_bytes,
+    prewarm_capture,
+    prewarm_imports,
+    merge_and_save,  # noqa: F401 - re-exported for existing callers
+)
+
 
 class DescriptionDialog:
     """Simple dialog to get capture description"""
@@ -36,6 +49,12 @@ class MultiCaptureOverlay:
     Supports multiple monitors and multiple region captures
     """
 
+    # Multi-monitor support using Windows API (cached at import)
+    virtual_x_min = VIRTUAL_X_MIN
+    virtual_y_min = VIRTUAL_Y_MIN
+    virtual_width = VIRTUAL_WIDTH
+    virtual_height = VIRTUAL_HEIGHT
+
     def __init__(self, output_file):
         self.output_file = output_file
         self.captures = []
@@ -46,22 +65,29 @@ class MultiCaptureOverlay:
 
         # Draggable instructions state
         self.is_dragging_instructions = False
-        self.drag_data = {'x': 0, 'y': 0}
-
-        # Multi-monitor support using Windows API
-        user32 = ctypes.windll.user32
-        self.virtual_x_min = user32.GetSystemMetrics(76)  # SM_XVIRTUALSCREEN
-        self.virtual_y_min = user32.GetSystemMetrics(77)  # SM_YVIRTUALSCREEN
-        self.virtual_width = user32.GetSystemMetrics(78)  # SM_CXVIRTUALSCREEN
-        self.virtual_height = user32.GetSystemMetrics(79)  # SM_CYVIRTUALSCREEN
+        self.drag_data = {'x': 0, 'y': 0, 'origin': (0, 0), 'target': (0, 0), 'pending': None}
 
         self.root = tk.Tk()
+
+        if self.virtual_width is None:
+            self.virtual_x_min = 0
+            self.virtual_y_min = 0
+            self.virtual_width = self.root.winfo_screenwidth()
+            self.virtual_height = self.root.winfo_screenheight()
+
+        # Deliberately a uniform -alpha rather than -transparentcolor: colour-keyed
+        # pixels of a layered window are click-through on Windows, so a keyed
+        # backdrop would send every drag to the desktop underneath. A static
+        # layered window is composited once per change, not per frame.
         self.root.attributes('-alpha', 0.3)
-        self.root.attributes('-fullscreen', True)
         self.root.attributes('-topmost', True)
 
-        # Set geometry to cover all monitors
+        # Borderless window covering all monitors - a single geometry call
+        # instead of -fullscreen followed by a second resize
+        self.root.overrideredirect(True)
         self.root.geometry(f"{self.virtual_width}x{self.virtual_height}+{self.virtual_x_min}+{self.virtual_y_min}")
+        # Borderless windows don't take focus by themselves; keys need it
+        self.root.focus_force()
 
         self.canvas = tk.Canvas(
             self.root,
@@ -74,6 +100,28 @@ class MultiCaptureOverlay:
         # Create moveable instruction box
         self.create_instructions()
 
+        # Selection rectangle is created once and shown/hidden, rather than
+        # deleted and recreated on every mouse press
+        self.selection_rect = self.canvas.create_rectangle(
+            0, 0, 0, 0,
+            outline='#4a9eff',
+            width=2,
+            state='hidden'
+        )
+
+        # Small ring of green rectangles marking already-captured regions,
+        # recycled so long sessions don't keep allocating canvas items
+        self.captured_rects = [
+            self.canvas.create_rectangle(
+                0, 0, 0, 0,
+                outline='#4CAF50',
+                width=2,
+                state='hidden'
+            )
+            for _ in range(5)
+        ]
+        self.next_captured_rect = 0
+
         # Bind events
         self.canvas.bind('<ButtonPress-1>', self.on_press)
         self.canvas.bind('<B1-Motion>', self.on_drag)
@@ -118,17 +166,32 @@ class MultiCaptureOverlay:
             'Drag this box to move it out of the way'
         ]
 
-        y_offset = y + 50
-        self.inst_texts = []
-        for i, line in enumerate(instructions):
-            text = self.canvas.create_text(
-                x + 200, y_offset + (i * 18),
-                text=line,
-                fill='white' if '**' not in line else '#4a9eff',
-                font=('Arial', 10, 'bold' if '**' in line else 'normal'),
+        # One multi-line item for the regular lines, plus one bold item laid
+        # over the blank line left for the highlighted shortcut
+        highlight = next(i for i, line in enumerate(instructions) if '**' in line)
+        regular_lines = ['' if i == highlight else line for i, line in enumerate(instructions)]
+        line_height = tkfont.Font(root=self.root, font=('Arial', 10)).metrics('linespace')
+        top = y + 41
+
+        self.inst_texts = [
+            self.canvas.create_text(
+                x + 200, top,
+                text='\n'.join(regular_lines),
+                fill='white',
+                font=('Arial', 10, 'normal'),
+                anchor='n',
+                justify='center',
+                tags='instructions'
+            ),
+            self.canvas.create_text(
+                x + 200, top + highlight * line_height,
+                text=instructions[highlight],
+                fill='#4a9eff',
+                font=('Arial', 10, 'bold'),
+                anchor='n',
                 tags='instructions'
             )
-            self.inst_texts.append(text)
+        ]
 
         # Capture counter
         self.inst_counter = self.canvas.create_text(
@@ -139,6 +202,9 @@ class MultiCaptureOverlay:
             tags='instructions'
         )
 
+        # Cached so on_press can hit-test with a plain point-in-rect check
+        self.inst_bbox = self.canvas.bbox('instructions')
+
         # Bind drag events to instructions tag
         self.canvas.tag_bind('instructions', '<ButtonPress-1>', self.on_instructions_press)
         self.canvas.tag_bind('instructions', '<B1-Motion>', self.on_instructions_drag)
@@ -147,27 +213,47 @@ class MultiCaptureOverlay:
     def on_instructions_press(self, event):
         """Start dragging instruction box"""
         self.is_dragging_instructions = True
-        self.drag_data['x'] = event.x
-        self.drag_data['y'] = event.y
+        # Remember where the drag started and where the box was, so each
+        # motion event is one absolute moveto() instead of a running delta
+        self.drag_data['x'] = event.x_root
+        self.drag_data['y'] = event.y_root
+        # moveto() places the first 'instructions' item, the background, so
+        # take the origin from that item rather than the union bbox
+        self.drag_data['origin'] = self.canvas.bbox(self.inst_bg)[:2]
         self.canvas.config(cursor='fleur')
         return "break"  # Stop event propagation
 
     def on_instructions_drag(self, event):
         """Drag instruction box"""
         if self.is_dragging_instructions:
-            dx = event.x - self.drag_data['x']
-            dy = event.y - self.drag_data['y']
-            self.canvas.move('instructions', dx, dy)
-            self.drag_data['x'] = event.x
-            self.drag_data['y'] = event.y
-            return "break"
+            # Coalesce motion events and redraw at most ~60 times a second
+            self.drag_data['target'] = (event.x_root, event.y_root)
+            if self.drag_data['pending'] is None:
+                self.drag_data['pending'] = self.root.after(16, self._apply_instructions_drag)
+        return "break"
+
+    def _apply_instructions_drag(self):
+        """Move instruction box to the latest dragged position"""
+        self.drag_data['pending'] = None
+        x_root, y_root = self.drag_data['target']
+        origin_x, origin_y = self.drag_data['origin']
+        self.canvas.moveto(
+            'instructions',
+            origin_x + x_root - self.drag_data['x'],
+            origin_y + y_root - self.drag_data['y']
+        )
 
     def on_instructions_release(self, event):
         """Stop dragging instruction box"""
         if self.is_dragging_instructions:
             self.is_dragging_instructions = False
+            # Land exactly where the mouse was released
+            if self.drag_data['pending'] is not None:
+                self.root.after_cancel(self.drag_data['pending'])
+                self._apply_instructions_drag()
+            self.inst_bbox = self.canvas.bbox('instructions')
             self.canvas.config(cursor='cross')
-            return "break"
+        return "break"
 
     def update_counter(self):
         """Update capture counter display"""
@@ -186,11 +272,10 @@ class MultiCaptureOverlay:
         self.root.bind('<Shift-Return>', self.on_capture)
         self.root.bind('<Escape>', self.on_finish)
 
-        # Show overlay again - restore fullscreen and deiconify
+        # Show overlay again - geometry is kept while withdrawn
         self.root.deiconify()
-        self.root.attributes('-fullscreen', True)
         self.root.attributes('-topmost', True)
-        print(f"   Overlay restored - drag to select next region", file=sys.stderr)
+        debug("Overlay restored - drag to select next region")
 
     def on_press(self, event):
         """Start drawing selection rectangle"""
@@ -198,21 +283,16 @@ class MultiCaptureOverlay:
             return
 
         # Check if clicking on instructions
-        overlapping = self.canvas.find_overlapping(event.x, event.y, event.x, event.y)
-        if any('instructions' in self.canvas.gettags(item) for item in overlapping):
+        x1, y1, x2, y2 = self.inst_bbox
+        if x1 <= event.x <= x2 and y1 <= event.y <= y2:
             return
 
         self.start_x = event.x
         self.start_y = event.y
 
-        if self.current_rect:
-            self.canvas.delete(self.current_rect)
-
-        self.current_rect = self.canvas.create_rectangle(
-            self.start_x, self.start_y, self.start_x, self.start_y,
-            outline='#4a9eff',
-            width=2
-        )
+        self.current_rect = self.selection_rect
+        self.canvas.coords(self.current_rect, self.start_x, self.start_y, self.start_x, self.start_y)
+        self.canvas.itemconfig(self.current_rect, state='normal')
 
     def on_drag(self, event):
         """Update selection rectangle"""
@@ -256,8 +336,12 @@ class MultiCaptureOverlay:
 
                 self.update_counter()
 
-                # Change current rectangle to green to show it's been captured
-                self.canvas.itemconfig(self.current_rect, outline='#4CAF50', width=2)
+                # Mark the captured region in green, reusing the oldest marker
+                marker = self.captured_rects[self.next_captured_rect]
+                self.next_captured_rect = (self.next_captured_rect + 1) % len(self.captured_rects)
+                self.canvas.coords(marker, *coords)
+                self.canvas.itemconfig(marker, state='normal')
+                self.canvas.itemconfig(self.current_rect, state='hidden')
 
                 # Reset for next capture
                 self.current_rect = None
@@ -265,7 +349,7 @@ class MultiCaptureOverlay:
                 self.start_y = None
 
                 print(f"✓ Captured region {len(self.captures)}: {width}x{height} at ({canvas_x}, {canvas_y})", file=sys.stderr)
-                print(f"   Drag to select next region, or press Shift+Enter to finish", file=sys.stderr)
+                debug("Drag to select next region, or press Shift+Enter to finish")
 
     def on_capture(self, event):
         """Capture current region and finish (Shift+Enter)"""
@@ -280,94 +364,16 @@ class MultiCaptureOverlay:
             'cancelled': len(self.captures) == 0
         }
 
-        with open(self.output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        # Temp file for screencatch.py - compact, nobody reads it by eye
+        with open(self.output_file, 'wb') as f:
+            f.write(json_bytes(result))
 
         self.root.destroy()
 
     def run(self):
         """Show overlay and wait for captures"""
+        # Load the heavy imports on a worker while the overlay sits idle. The
+        # GDI objects are made on this thread, which grabs and releases them.
+        threading.Thread(target=prewarm_imports, daemon=True).start()
+        self.root.after_idle(prewarm_capture)
         self.root.mainloop()
-
-
-def merge_and_save(regions, output_dir, description=None, merge_method='auto', spacing=10, recapture_iteration=0):
-    """
-    Capture screen regions and merge/save them
-
-    Args:
-        regions: List of region dicts with x, y, width, height
-        output_dir: Directory to save output
-        description: Optional description text
-        merge_method: How to merge multiple captures
-        spacing: Spacing between merged images
-        recapture_iteration: Recapture attempt number
-
-    Returns:
-        (filepath, metadata) tuple
-    """
-    from PIL import ImageGrab
-    import os
-    from datetime import datetime
-    from pathlib import Path
-
-    # Import image merger
-    from image_merger import ImageMerger
-
-    # Capture individual regions
-    images = []
-    for region in regions:
-        # PIL ImageGrab uses screen coordinates directly
-        bbox = (
-            region['x'],
-            region['y'],
-            region['x'] + region['width'],
-            region['y'] + region['height']
-        )
-        img = ImageGrab.grab(bbox=bbox)
-        images.append(img)
-
-    # Generate filename
-    timestamp = datetime.now()
-    year = timestamp.year
-    month = str(timestamp.month).zfill(2)
-    day = str(timestamp.day).zfill(2)
-    hours = str(timestamp.hour).zfill(2)
-    minutes = str(timestamp.minute).zfill(2)
-    seconds = str(timestamp.second).zfill(2)
-    filename = f"capture_{year}-{month}-{day}_{hours}{minutes}{seconds}.png"
-    filepath = os.path.join(output_dir, filename)
-
-    # Save or merge images
-    if len(images) == 1:
-        images[0].save(filepath)
-    else:
-        # Merge multiple images
-        merged = None
-        if merge_method == 'vertical':
-            merged = ImageMerger.merge_vertical(images, spacing)
-        elif merge_method == 'horizontal':
-            merged = ImageMerger.merge_horizontal(images, spacing)
-        elif merge_method == 'grid':
-            merged = ImageMerger.merge_grid(images, spacing=spacing)
-        else:  # auto
-            merged = ImageMerger.merge_auto(images, spacing)
-
-        merged.save(filepath)
-
-    # Save metadata
-    metadata = {
-        'description': description or '',
-        'timestamp': timestamp.isoformat(),
-        'captures': len(regions),
-        'merged': len(regions) > 1,
-        'filepath': filepath,
-        'regions': regions,
-        'recapture_iteration': recapture_iteration,
-        'merge_method': merge_method
-    }
-
-    metadata_path = filepath.replace('.png', '.json')
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
-
-    return filepath, metadata
@@ -5,14 +5,17 @@ GUI-based stitching capture with control panel
 """
 
 import sys
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from PIL import ImageGrab
 import tkinter as tk
 from tkinter import ttk
 
+from _grab import COMPOSITE_DELAY_MS, Grabber, spill, load_spilled, write_spilled_png, remove_spilled
+from _save import PNG_LEVEL, OUTPUT_EXT, save_capture, save_stitched
+from capture import json_bytes, VIRTUAL_X_MIN, VIRTUAL_Y_MIN, VIRTUAL_WIDTH, VIRTUAL_HEIGHT
+
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -25,14 +28,8 @@ class SimpleCaptureOverlay:
     def __init__(self, parent=None):
         self.region = None
         self.cancelled = False
-
-        # Multi-monitor support
-        import ctypes
-        user32 = ctypes.windll.user32
-        virtual_x_min = user32.GetSystemMetrics(76)
-        virtual_y_min = user32.GetSystemMetrics(77)
-        virtual_width = user32.GetSystemMetrics(78)
-        virtual_height = user32.GetSystemMetrics(79)
+        self.closed = False
+        self._close_timer = None  # Fallback close scheduled on release
 
         # Use Toplevel if parent exists, otherwise create new Tk
         if parent:
@@ -43,7 +40,8 @@ class SimpleCaptureOverlay:
         self.root.attributes('-alpha', 0.3)
         self.root.attributes('-fullscreen', True)
         self.root.attributes('-topmost', True)
-        self.root.geometry(f"{virtual_width}x{virtual_height}+{virtual_x_min}+{virtual_y_min}")
+        # Multi-monitor support
+        self.root.geometry(f"{VIRTUAL_WIDTH}x{VIRTUAL_HEIGHT}+{VIRTUAL_X_MIN}+{VIRTUAL_Y_MIN}")
 
         self.canvas = tk.Canvas(self.root, cursor='cross', bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -88,11 +86,35 @@ class SimpleCaptureOverlay:
                     'width': width,
                     'height': height
                 }
-                self.root.destroy()
+                # Hide first and only finish shortly after the window manager
+                # reports the overlay unmapped, so the caller can grab straight
+                # away. The timer is a fallback in case <Unmap> never arrives.
+                self.root.bind('<Unmap>', self.on_unmap)
+                self._close_timer = self.root.after(100, self._close)
+                self.root.withdraw()
+
+    def on_unmap(self, event):
+        if event.widget is self.root and not self.closed:
+            # Unmapped is not yet composited; the screen can still show the
+            # tinted overlay for a frame, so wait a moment before closing
+            if self._close_timer is not None:
+                self.root.after_cancel(self._close_timer)
+            self._close_timer = self.root.after(COMPOSITE_DELAY_MS, self._close)
+
+    def _close(self):
+        if not self.closed:
+            self.closed = True
+            # destroy() deletes the callback's Tcl command, but the timer
+            # lives on in the parent's interpreter; cancel it so it can't
+            # fire into a missing command
+            if self._close_timer is not None:
+                self.root.after_cancel(self._close_timer)
+                self._close_timer = None
+            self.root.destroy()
 
     def on_cancel(self, event):
         self.cancelled = True
-        self.root.destroy()
+        self._close()
 
     def run(self):
         # Use wait_window for Toplevel, mainloop for standalone Tk
@@ -118,10 +140,13 @@ class ControlPanel:
         self.root.resizable(False, False)
 
         # Data
-        self.captured_images = []
+        self.capture_paths = []  # (temp path, size) per capture
         self.system = tk.StringVar()
         self.name = tk.StringVar()
         self.description = tk.StringVar()
+        # Grabs run on one worker thread, which also owns the grabber
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._grabber = Grabber()
 
         # Build UI
         self.build_ui()
@@ -190,7 +215,7 @@ class ControlPanel:
 
     def update_count(self):
         """Update capture count display"""
-        self.count_label.config(text=f"Captures: {len(self.captured_images)}")
+        self.count_label.config(text=f"Captures: {len(self.capture_paths)}")
 
     def capture(self):
         """Trigger a capture"""
@@ -204,62 +229,76 @@ class ControlPanel:
         overlay = SimpleCaptureOverlay(parent=self.root)
         region = overlay.run()
 
-        # Give time for overlay to fully disappear from screen
-        import time
-        time.sleep(0.1)
-
-        if region:
-            # Capture the screen region after overlay is gone
-            bbox = (
-                region['x'],
-                region['y'],
-                region['x'] + region['width'],
-                region['y'] + region['height']
-            )
-            img = ImageGrab.grab(bbox=bbox)
-            self.captured_images.append(img)
-
-        # Restore control panel
+        if not region:
+            self.root.deiconify()
+            self.status_label.config(text="Capture cancelled", foreground='orange')
+            return
+
+        # run() returns once the overlay is unmapped, so it's already gone
+        bbox = (
+            region['x'],
+            region['y'],
+            region['x'] + region['width'],
+            region['y'] + region['height']
+        )
+        # Grab, decode and spill on the worker thread so the Tk loop keeps running
+        future = self._executor.submit(self._capture_to_disk, bbox)
+        self.root.after(10, self._poll_capture, future, region)
+
+    def _capture_to_disk(self, bbox):
+        """Grab bbox and spill it to a temp file; runs on the worker thread
+
+        Captures are a full drag apart, so a cached full-screen frame would
+        always be stale; grab just the selected region instead.
+        """
+        return spill(self._grabber.grab(bbox))
+
+    def _poll_capture(self, future, region):
+        """Wait for a background grab, then store it and restore the panel"""
+        if not future.done():
+            self.root.after(10, self._poll_capture, future, region)
+            return
+
+        self.capture_paths.append(future.result())
+
+        # Restore control panel only after the grab, so it isn't captured
         self.root.deiconify()
 
-        if region:
-            self.update_count()
-            self.status_label.config(
-                text=f"✓ Captured {region['width']}x{region['height']}",
-                foreground='green'
-            )
-        else:
-            self.status_label.config(text="Capture cancelled", foreground='orange')
+        self.update_count()
+        self.status_label.config(
+            text=f"✓ Captured {region['width']}x{region['height']}",
+            foreground='green'
+        )
 
     def done(self):
         """Finish and save captures"""
-        if not self.captured_images:
+        if not self.capture_paths:
             self.status_label.config(text="No captures to save!", foreground='red')
             return
 
         self.status_label.config(text="Processing...", foreground='blue')
         self.root.update()
 
-        # Import image stitcher
-        from image_stitcher import ImageStitcher
-
         # Generate filename
         timestamp = datetime.now()
-        year = timestamp.year
-        month = str(timestamp.month).zfill(2)
-        day = str(timestamp.day).zfill(2)
-        hours = str(timestamp.hour).zfill(2)
-        minutes = str(timestamp.minute).zfill(2)
-        seconds = str(timestamp.second).zfill(2)
-        filename = f"capture_{year}-{month}-{day}_{hours}{minutes}{seconds}.png"
+        filename = f"capture_{timestamp:%Y-%m-%d_%H%M%S}.{OUTPUT_EXT}"
         filepath = os.path.join(os.getcwd(), filename)
 
-        # Save or stitch
-        if len(self.captured_images) == 1:
-            self.captured_images[0].save(filepath)
+        # Save or stitch, loading the spilled captures one at a time
+        images = load_spilled(self.capture_paths)
+        if len(self.capture_paths) == 1:
+            # PNG output: encode the spilled RGB bytes directly, no PIL image
+            if OUTPUT_EXT != 'png' or not write_spilled_png(self.capture_paths[0], filepath, PNG_LEVEL):
+                filepath = save_capture(next(images), filepath)
         else:
-            stitched = ImageStitcher.stitch_images(self.captured_images)
-            stitched.save(filepath)
+            sizes = [size for _, size in self.capture_paths]
+            filepath = save_stitched(images, sizes, filepath)
+
+        # Saved; the spilled captures are no longer needed
+        remove_spilled(self.capture_paths)
+
+        # Close the grabber on the thread that created it
+        self._executor.submit(self._grabber.close)
 
         # Save metadata
         metadata = {
@@ -267,14 +306,13 @@ class ControlPanel:
             'name': self.name.get(),
             'description': self.description.get(),
             'timestamp': timestamp.isoformat(),
-            'captures': len(self.captured_images),
-            'merged': len(self.captured_images) > 1,
+            'captures': len(self.capture_paths),
+            'merged': len(self.capture_paths) > 1,
             'filepath': filepath
         }
 
-        metadata_path = filepath.replace('.png', '.json')
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = os.path.splitext(filepath)[0] + '.json'
+        Path(metadata_path).write_bytes(json_bytes(metadata, indent=True))
 
         self.status_label.config(
             text=f"✓ Saved to {os.path.basename(filepath)}",
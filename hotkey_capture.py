@@ -6,15 +6,16 @@ Press a hotkey to capture each region, no persistent overlay
 """
 
 import sys
-import json
 import argparse
 import os
 from pathlib import Path
 from datetime import datetime
-from PIL import ImageGrab
 import tkinter as tk
 from tkinter import simpledialog
-import keyboard  # pip install keyboard
+
+from _grab import COMPOSITE_DELAY_MS, Grabber, spill, load_spilled, write_spilled_png, remove_spilled
+from _save import PNG_LEVEL, OUTPUT_EXT, save_capture, save_stitched
+from capture import json_bytes, VIRTUAL_X_MIN, VIRTUAL_Y_MIN, VIRTUAL_WIDTH, VIRTUAL_HEIGHT
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -25,16 +26,20 @@ class HotkeyCapture:
     def __init__(self, output_dir, description=None):
         self.output_dir = output_dir
         self.description = description
-        self.captured_images = []  # Store actual images, not just regions
+        self.capture_paths = []  # (temp path, size) per capture, spilled to disk
         self.capture_count = 0
+        self._grabber = Grabber()
+        self._overlay = None  # Built on the first capture
 
     def capture_region(self):
         """Show overlay, capture one region, then hide overlay"""
         print(f"\n>>> Press ESC to cancel, or drag to select region <<<", file=sys.stderr)
 
-        # Create overlay just for this one capture
-        overlay = SingleCaptureOverlay()
-        region = overlay.run()
+        # Tk objects must stay on the hotkey thread, so the overlay is built
+        # on the first capture there and reused for every later one
+        if self._overlay is None:
+            self._overlay = SingleCaptureOverlay()
+        region = self._overlay.run()
 
         if region:
             # Immediately capture the screen region while it's still there
@@ -44,8 +49,7 @@ class HotkeyCapture:
                 region['x'] + region['width'],
                 region['y'] + region['height']
             )
-            img = ImageGrab.grab(bbox=bbox)
-            self.captured_images.append(img)
+            self.capture_paths.append(spill(self._grabber.grab(bbox)))
             self.capture_count += 1
             print(f"✓ Captured region {self.capture_count}: {region['width']}x{region['height']}", file=sys.stderr)
             return True
@@ -55,74 +59,71 @@ class HotkeyCapture:
 
     def finish(self):
         """Merge and save all captures"""
-        if not self.captured_images:
+        if not self.capture_paths:
             print("No captures to save", file=sys.stderr)
             return None
 
-        print(f"\nProcessing {len(self.captured_images)} capture(s)...", file=sys.stderr)
-
-        # Import image stitcher
-        from image_stitcher import ImageStitcher
+        print(f"\nProcessing {len(self.capture_paths)} capture(s)...", file=sys.stderr)
 
         # Generate filename
         timestamp = datetime.now()
-        year = timestamp.year
-        month = str(timestamp.month).zfill(2)
-        day = str(timestamp.day).zfill(2)
-        hours = str(timestamp.hour).zfill(2)
-        minutes = str(timestamp.minute).zfill(2)
-        seconds = str(timestamp.second).zfill(2)
-        filename = f"capture_{year}-{month}-{day}_{hours}{minutes}{seconds}.png"
+        filename = f"capture_{timestamp:%Y-%m-%d_%H%M%S}.{OUTPUT_EXT}"
         filepath = os.path.join(self.output_dir, filename)
 
-        # Save or stitch
-        if len(self.captured_images) == 1:
-            self.captured_images[0].save(filepath)
+        # Save or stitch, loading the spilled captures one at a time
+        images = load_spilled(self.capture_paths)
+        if len(self.capture_paths) == 1:
+            # PNG output: encode the spilled RGB bytes directly, no PIL image
+            if OUTPUT_EXT != 'png' or not write_spilled_png(self.capture_paths[0], filepath, PNG_LEVEL):
+                filepath = save_capture(next(images), filepath)
         else:
             print(f"Stitching images together by finding overlapping content...", file=sys.stderr)
-            stitched = ImageStitcher.stitch_images(self.captured_images)
-            stitched.save(filepath)
+            sizes = [size for _, size in self.capture_paths]
+            filepath = save_stitched(images, sizes, filepath)
+
+        remove_spilled(self.capture_paths)
+        self._grabber.close()
+        if self._overlay is not None:
+            self._overlay.destroy()
+            self._overlay = None
 
         # Save metadata
         metadata = {
             'description': self.description or '',
             'timestamp': timestamp.isoformat(),
-            'captures': len(self.captured_images),
-            'merged': len(self.captured_images) > 1,
+            'captures': len(self.capture_paths),
+            'merged': len(self.capture_paths) > 1,
             'filepath': filepath
         }
 
-        metadata_path = filepath.replace('.png', '.json')
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = os.path.splitext(filepath)[0] + '.json'
+        Path(metadata_path).write_bytes(json_bytes(metadata, indent=True))
 
         print(f"✓ Saved to: {filepath}", file=sys.stderr)
-        if len(self.captured_images) > 1:
-            print(f"✓ Stitched {len(self.captured_images)} captures into panorama", file=sys.stderr)
+        if len(self.capture_paths) > 1:
+            print(f"✓ Stitched {len(self.capture_paths)} captures into panorama", file=sys.stderr)
 
         return filepath
 
 
 class SingleCaptureOverlay:
-    """Simple overlay for capturing ONE region"""
+    """
+    Simple overlay for capturing ONE region
+
+    Built once and reused: each run() shows it again, and it hides itself
+    as soon as a region is chosen or the capture is cancelled.
+    """
 
     def __init__(self):
         self.region = None
         self.cancelled = False
 
-        # Multi-monitor support
-        import ctypes
-        user32 = ctypes.windll.user32
-        self.virtual_x_min = user32.GetSystemMetrics(76)
-        self.virtual_y_min = user32.GetSystemMetrics(77)
-        self.virtual_width = user32.GetSystemMetrics(78)
-        self.virtual_height = user32.GetSystemMetrics(79)
-
         self.root = tk.Tk()
         self.root.attributes('-alpha', 0.3)
         self.root.attributes('-fullscreen', True)
         self.root.attributes('-topmost', True)
-        self.root.geometry(f"{self.virtual_width}x{self.virtual_height}+{self.virtual_x_min}+{self.virtual_y_min}")
+        # Multi-monitor support
+        self.root.geometry(f"{VIRTUAL_WIDTH}x{VIRTUAL_HEIGHT}+{VIRTUAL_X_MIN}+{VIRTUAL_Y_MIN}")
 
         self.canvas = tk.Canvas(self.root, cursor='cross', bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -167,18 +168,50 @@ class SingleCaptureOverlay:
                     'width': width,
                     'height': height
                 }
-                self.root.destroy()
+                self.hide()
 
     def on_cancel(self, event):
         self.cancelled = True
-        self.root.destroy()
+        self.hide()
 
-    def run(self):
+    def reset(self):
+        """Clear the previous selection"""
+        self.region = None
+        self.cancelled = False
+        self.start_x = None
+        self.start_y = None
+        if self.rect:
+            self.canvas.delete(self.rect)
+            self.rect = None
+
+    def show(self):
+        """Bring the overlay back for a new selection"""
+        self.reset()
+        self.root.deiconify()
+        self.root.attributes('-topmost', True)
+        self.root.focus_force()
+
+    def hide(self):
+        """Withdraw the overlay and return from wait()"""
+        self.root.withdraw()
+        # Leave the compositor time to drop the overlay before the caller
+        # grabs the screen
+        self.root.after(COMPOSITE_DELAY_MS, self.root.quit)
+
+    def wait(self):
+        """Process events until a region is chosen or cancelled"""
         self.root.mainloop()
+
+    def run(self):
+        self.show()
+        self.wait()
         if self.cancelled or not self.region:
             return None
         return self.region
 
+    def destroy(self):
+        self.root.destroy()
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -238,6 +271,9 @@ Workflow:
             print("="*60 + "\n", file=sys.stderr)
         sys.exit(0)
 
+    # Imported here so --help and argument errors don't pay for the hook
+    import keyboard  # pip install keyboard
+
     # Register hotkeys
     keyboard.add_hotkey('f9', on_capture_hotkey)
     keyboard.add_hotkey('f10', on_finish_hotkey)
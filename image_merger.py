@@ -3,13 +3,181 @@
 Image merging utilities for combining multiple screenshots
 """
 
-from PIL import Image, ImageDraw, ImageFont
+import math
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import sys
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+@lru_cache(maxsize=4)
+def _font(size: int = 16):
+    """Load the header font once per size instead of re-parsing it per call"""
+    try:
+        # Try to use a nice font, fall back to default if not available
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
 
 class ImageMerger:
     """Merge multiple images into a single composite"""
 
+    @staticmethod
+    def layout_vertical(sizes: List[Tuple[int, int]], spacing: int = 10) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+        """Compute canvas size and paste offsets for a vertical stack"""
+        # Calculate total dimensions
+        max_width = max(w for w, h in sizes)
+        total_height = sum(h for w, h in sizes) + spacing * (len(sizes) - 1)
+
+        offsets = []
+        y_offset = 0
+        for w, h in sizes:
+            # Center horizontally
+            offsets.append(((max_width - w) // 2, y_offset))
+            y_offset += h + spacing
+
+        return (max_width, total_height), offsets
+
+    @staticmethod
+    def layout_horizontal(sizes: List[Tuple[int, int]], spacing: int = 10) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+        """Compute canvas size and paste offsets for a horizontal stack"""
+        # Calculate total dimensions
+        total_width = sum(w for w, h in sizes) + spacing * (len(sizes) - 1)
+        max_height = max(h for w, h in sizes)
+
+        offsets = []
+        x_offset = 0
+        for w, h in sizes:
+            # Center vertically
+            offsets.append((x_offset, (max_height - h) // 2))
+            x_offset += w + spacing
+
+        return (total_width, max_height), offsets
+
+    @staticmethod
+    def layout_grid(sizes: List[Tuple[int, int]], cols: int = None, spacing: int = 10) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+        """Compute canvas size and paste offsets for a grid"""
+        # Auto-calculate grid dimensions
+        if cols is None:
+            # Try to make roughly square: ceil(sqrt(n)) in integer math
+            cols = math.isqrt(len(sizes))
+            cols += cols * cols < len(sizes)
+
+        rows = (len(sizes) + cols - 1) // cols  # Ceiling division
+
+        # Find max dimensions for each cell
+        max_cell_width = max(w for w, h in sizes)
+        max_cell_height = max(h for w, h in sizes)
+
+        # Calculate total dimensions
+        total_width = max_cell_width * cols + spacing * (cols - 1)
+        total_height = max_cell_height * rows + spacing * (rows - 1)
+
+        offsets = []
+        for idx, (w, h) in enumerate(sizes):
+            row = idx // cols
+            col = idx % cols
+
+            x_offset = col * (max_cell_width + spacing) + (max_cell_width - w) // 2
+            y_offset = row * (max_cell_height + spacing) + (max_cell_height - h) // 2
+            offsets.append((x_offset, y_offset))
+
+        return (total_width, total_height), offsets
+
+    @staticmethod
+    def layout_auto(sizes: List[Tuple[int, int]], spacing: int = 10) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+        """Choose the best layout based on image count and aspect ratios"""
+        if len(sizes) == 2:
+            # For 2 images, decide based on aspect ratio
+            avg_aspect = sum(w / h for w, h in sizes) / len(sizes)
+            if avg_aspect > 1.5:  # Wide images - stack vertically
+                return ImageMerger.layout_vertical(sizes, spacing)
+            else:  # Tall or square - stack horizontally
+                return ImageMerger.layout_horizontal(sizes, spacing)
+
+        elif len(sizes) <= 4:
+            # For 3-4 images, use grid
+            return ImageMerger.layout_grid(sizes, cols=2, spacing=spacing)
+
+        else:
+            # For 5+ images, use grid with auto columns
+            return ImageMerger.layout_grid(sizes, spacing=spacing)
+
+    @staticmethod
+    def layout(sizes: List[Tuple[int, int]], method: str = 'auto', spacing: int = 10) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+        """
+        Compute the merged canvas size and per-image paste offsets
+
+        Args:
+            sizes: List of (width, height) tuples in merge order
+            method: 'vertical', 'horizontal', 'grid' or 'auto'
+            spacing: Spacing between images
+
+        Returns:
+            ((canvas_width, canvas_height), [(x, y), ...]) tuple
+        """
+        if not sizes:
+            raise ValueError("No images to merge")
+
+        if method == 'vertical':
+            return ImageMerger.layout_vertical(sizes, spacing)
+        elif method == 'horizontal':
+            return ImageMerger.layout_horizontal(sizes, spacing)
+        elif method == 'grid':
+            return ImageMerger.layout_grid(sizes, spacing=spacing)
+        else:  # auto
+            return ImageMerger.layout_auto(sizes, spacing)
+
+    @staticmethod
+    def compose(images: Iterable[Image.Image], canvas_size: Tuple[int, int], offsets: List[Tuple[int, int]], background_color: str = '#ffffff', axis: int = None) -> Image.Image:
+        """
+        Paste images into a single canvas at precomputed offsets
+
+        images may be a generator; each image is released as soon as it has
+        been pasted, so only the canvas and one source are alive at a time.
+
+        axis marks a vertical (0) or horizontal (1) stack, offsets ordered
+        along it. The images then cover everything except the spacing bands
+        and the margins beside smaller images, so only those are painted
+        with the background instead of filling the whole canvas first.
+        """
+        width, height = canvas_size
+        background = ImageColor.getrgb(background_color)[:3]
+        if axis is None:
+            canvas = np.full((height, width, 3), background, dtype=np.uint8)
+        else:
+            canvas = np.empty((height, width, 3), dtype=np.uint8)
+
+        # One contiguous slice copy per image instead of PIL's paste dispatch
+        end = 0  # Where the previous image ended along the stack axis
+        for img, (x, y) in zip(images, offsets):
+            if img.mode in ('RGBA', 'RGBX'):
+                # convert('RGB') just drops the fourth band; slicing it off
+                # skips that conversion pass and its full-size copy
+                pixels = np.asarray(img)[:, :, :3]
+            else:
+                pixels = np.asarray(img if img.mode == 'RGB' else img.convert('RGB'))
+            w, h = img.size
+            if axis == 0:
+                canvas[end:y] = background
+                canvas[y:y + h, :x] = background
+                canvas[y:y + h, x + w:] = background
+                end = y + h
+            elif axis == 1:
+                canvas[:, end:x] = background
+                canvas[:y, x:x + w] = background
+                canvas[y + h:, x:x + w] = background
+                end = x + w
+            canvas[y:y + h, x:x + w] = pixels
+
+        if axis == 0:
+            canvas[end:] = background
+        elif axis == 1:
+            canvas[:, end:] = background
+
+        return Image.fromarray(canvas)
+
     @staticmethod
     def merge_vertical(images: List[Image.Image], spacing: int = 10, background_color: str = '#ffffff') -> Image.Image:
         """Stack images vertically with spacing"""
@@ -19,22 +187,8 @@ class ImageMerger:
         if len(images) == 1:
             return images[0]
 
-        # Calculate total dimensions
-        max_width = max(img.width for img in images)
-        total_height = sum(img.height for img in images) + spacing * (len(images) - 1)
-
-        # Create new image
-        merged = Image.new('RGB', (max_width, total_height), background_color)
-
-        # Paste images
-        y_offset = 0
-        for img in images:
-            # Center horizontally
-            x_offset = (max_width - img.width) // 2
-            merged.paste(img, (x_offset, y_offset))
-            y_offset += img.height + spacing
-
-        return merged
+        canvas_size, offsets = ImageMerger.layout_vertical([img.size for img in images], spacing)
+        return ImageMerger.compose(images, canvas_size, offsets, background_color, axis=0)
 
     @staticmethod
     def merge_horizontal(images: List[Image.Image], spacing: int = 10, background_color: str = '#ffffff') -> Image.Image:
@@ -45,22 +199,8 @@ class ImageMerger:
         if len(images) == 1:
             return images[0]
 
-        # Calculate total dimensions
-        total_width = sum(img.width for img in images) + spacing * (len(images) - 1)
-        max_height = max(img.height for img in images)
-
-        # Create new image
-        merged = Image.new('RGB', (total_width, max_height), background_color)
-
-        # Paste images
-        x_offset = 0
-        for img in images:
-            # Center vertically
-            y_offset = (max_height - img.height) // 2
-            merged.paste(img, (x_offset, y_offset))
-            x_offset += img.width + spacing
-
-        return merged
+        canvas_size, offsets = ImageMerger.layout_horizontal([img.size for img in images], spacing)
+        return ImageMerger.compose(images, canvas_size, offsets, background_color, axis=1)
 
     @staticmethod
     def merge_grid(images: List[Image.Image], cols: int = None, spacing: int = 10, background_color: str = '#ffffff') -> Image.Image:
@@ -71,35 +211,27 @@ class ImageMerger:
         if len(images) == 1:
             return images[0]
 
-        # Auto-calculate grid dimensions
-        if cols is None:
-            # Try to make roughly square
-            cols = int(len(images) ** 0.5) + (1 if len(images) ** 0.5 % 1 > 0 else 0)
-
-        rows = (len(images) + cols - 1) // cols  # Ceiling division
+        canvas_size, offsets = ImageMerger.layout_grid([img.size for img in images], cols, spacing)
+        return ImageMerger.compose(images, canvas_size, offsets, background_color)
 
-        # Find max dimensions for each cell
-        max_cell_width = max(img.width for img in images)
-        max_cell_height = max(img.height for img in images)
-
-        # Calculate total dimensions
-        total_width = max_cell_width * cols + spacing * (cols - 1)
-        total_height = max_cell_height * rows + spacing * (rows - 1)
-
-        # Create new image
-        merged = Image.new('RGB', (total_width, total_height), background_color)
-
-        # Paste images
-        for idx, img in enumerate(images):
-            row = idx // cols
-            col = idx % cols
-
-            x_offset = col * (max_cell_width + spacing) + (max_cell_width - img.width) // 2
-            y_offset = row * (max_cell_height + spacing) + (max_cell_height - img.height) // 2
-
-            merged.paste(img, (x_offset, y_offset))
+    @staticmethod
+    def _merge_two_fast(a: Image.Image, b: Image.Image, spacing: int, background_color: str) -> Image.Image:
+        """merge_auto for exactly two images, with the layout_auto math inlined"""
+        aw, ah = a.size
+        bw, bh = b.size
+
+        if (aw / ah + bw / bh) / 2 > 1.5:
+            # Wide images - stack vertically, centered horizontally
+            canvas_size = (max(aw, bw), ah + spacing + bh)
+            offsets = [((canvas_size[0] - aw) // 2, 0), ((canvas_size[0] - bw) // 2, ah + spacing)]
+            axis = 0
+        else:
+            # Tall or square - stack horizontally, centered vertically
+            canvas_size = (aw + spacing + bw, max(ah, bh))
+            offsets = [(0, (canvas_size[1] - ah) // 2), (aw + spacing, (canvas_size[1] - bh) // 2)]
+            axis = 1
 
-        return merged
+        return ImageMerger.compose((a, b), canvas_size, offsets, background_color, axis)
 
     @staticmethod
     def merge_auto(images: List[Image.Image], spacing: int = 10, background_color: str = '#ffffff') -> Image.Image:
@@ -110,30 +242,17 @@ class ImageMerger:
         if len(images) == 1:
             return images[0]
 
+        # Two captures is the common case; skip the generic layout dispatch
         if len(images) == 2:
-            # For 2 images, decide based on aspect ratio
-            avg_aspect = sum(img.width / img.height for img in images) / len(images)
-            if avg_aspect > 1.5:  # Wide images - stack vertically
-                return ImageMerger.merge_vertical(images, spacing, background_color)
-            else:  # Tall or square - stack horizontally
-                return ImageMerger.merge_horizontal(images, spacing, background_color)
+            return ImageMerger._merge_two_fast(images[0], images[1], spacing, background_color)
 
-        elif len(images) <= 4:
-            # For 3-4 images, use grid
-            return ImageMerger.merge_grid(images, cols=2, spacing=spacing, background_color=background_color)
-
-        else:
-            # For 5+ images, use grid with auto columns
-            return ImageMerger.merge_grid(images, spacing=spacing, background_color=background_color)
+        canvas_size, offsets = ImageMerger.layout_auto([img.size for img in images], spacing)
+        return ImageMerger.compose(images, canvas_size, offsets, background_color)
 
     @staticmethod
     def add_description_header(image: Image.Image, description: str, padding: int = 20, background_color: str = '#f0f0f0') -> Image.Image:
         """Add a description header to the image"""
-        try:
-            # Try to use a nice font, fall back to default if not available
-            font = ImageFont.truetype("arial.ttf", 16)
-        except:
-            font = ImageFont.load_default()
+        font = _font(16)
 
         # Create a temporary image to measure text size
         temp_img = Image.new('RGB', (1, 1))
@@ -144,20 +263,22 @@ class ImageMerger:
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
-        # Create new image with header space
+        # Render only the header strip; anything the text would draw past it
+        # was covered by the pasted image before, so clipping matches
         header_height = text_height + padding * 2
-        new_image = Image.new('RGB', (image.width, image.height + header_height), background_color)
+        header = Image.new('RGB', (image.width, header_height), background_color)
 
         # Draw description
-        draw = ImageDraw.Draw(new_image)
+        draw = ImageDraw.Draw(header)
         text_x = (image.width - text_width) // 2
         text_y = padding
         draw.text((text_x, text_y), description, fill='#000000', font=font)
 
-        # Paste original image below header
-        new_image.paste(image, (0, header_height))
-
-        return new_image
+        # Stack header and image with one concatenate instead of allocating
+        # the full canvas and pasting the (possibly huge) image into it
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return Image.fromarray(np.concatenate([np.asarray(header), np.asarray(image)], axis=0))
 
 def main():
     """Test the image merger"""
@@ -4,33 +4,52 @@ Image stitching - combines images by finding overlapping content
 """
 
 import sys
-import cv2
+import zlib
+import struct
 import numpy as np
 from PIL import Image
-from typing import List
+from typing import Iterable, List, Tuple, Union
+
+# A PIL image, or an H x W x C uint8 array such as a raw screen grab
+Frame = Union[Image.Image, np.ndarray]
+
+
+def _frame_size(img: Frame) -> Tuple[int, int]:
+    """(width, height) of a PIL image or pixel array"""
+    if isinstance(img, np.ndarray):
+        return img.shape[1], img.shape[0]
+    return img.size
+
 
 class ImageStitcher:
     """Stitch images together by finding overlapping regions"""
 
     @staticmethod
-    def stitch_images(images: List[Image.Image]) -> Image.Image:
+    def stitch_images(images: Iterable[Frame], sizes: List[Tuple[int, int]] = None) -> Frame:
         """
         Stitch multiple images together by stacking vertically
 
         Args:
-            images: List of PIL Images in capture order
+            images: PIL Images or uint8 pixel arrays in capture order
+            sizes: Optional (width, height) of each image; when given, images
+                may be a generator and is consumed one image at a time
 
         Returns:
-            Single stitched PIL Image
+            Single stitched image, an array when arrays were given. Arrays
+            are stacked channel for channel, so BGR input gives BGR output.
         """
-        if not images:
+        if sizes is None:
+            images = list(images)
+            sizes = [_frame_size(img) for img in images]
+
+        if not sizes:
             raise ValueError("No images to stitch")
 
-        if len(images) == 1:
-            return images[0]
+        if len(sizes) == 1:
+            return next(iter(images))
 
         # Just use simple vertical merge - skip OpenCV panorama stitching
-        return ImageStitcher._fallback_vertical_merge(images)
+        return ImageStitcher._fallback_vertical_merge(images, sizes)
 
     @staticmethod
     def detect_vertical_overlap(img1: Image.Image, img2: Image.Image, max_overlap: int = None) -> int:
@@ -46,49 +65,54 @@ class ImageStitcher:
         Returns:
             Number of overlapping pixels (0 = no overlap)
         """
-        if max_overlap is None:
-            max_overlap = int(min(img1.height, img2.height) * 0.95)  # Check up to 95% overlap
+        return ImageStitcher._detect_overlap_from_arrays(
+            ImageStitcher._pixels(img1), ImageStitcher._pixels(img2), max_overlap
+        )
 
-        # Convert to numpy arrays for faster comparison
-        arr1 = np.array(img1)
-        arr2 = np.array(img2)
+    @staticmethod
+    def _pixels(img: Image.Image) -> np.ndarray:
+        """
+        RGB pixel array for overlap detection
+
+        Scored in colour: the MSE thresholds below are calibrated on RGB,
+        and content that differs only in hue has the same luma.
+        """
+        return np.asarray(img if img.mode == 'RGB' else img.convert('RGB'))
+
+    @staticmethod
+    def _detect_overlap_from_arrays(arr1: np.ndarray, arr2: np.ndarray, max_overlap: int = None) -> int:
+        """detect_vertical_overlap on RGB arrays from _pixels()"""
+        # OpenCV takes a few hundred ms to import and only overlap detection
+        # uses it, so plain stacking never loads it
+        import cv2
+
+        if max_overlap is None:
+            max_overlap = int(min(arr1.shape[0], arr2.shape[0]) * 0.95)  # Check up to 95% overlap
 
         # Ensure same width (crop if needed)
         min_width = min(arr1.shape[1], arr2.shape[1])
         arr1 = arr1[:, :min_width]
         arr2 = arr2[:, :min_width]
 
-        best_overlap = 0
-        best_score = float('inf')
-
-        # Store scores to find a significant dip
-        scores = []
-
-        # Try different overlap amounts
-        for overlap in range(10, min(max_overlap, arr1.shape[0], arr2.shape[0])):
-            # Get bottom 'overlap' rows from img1
-            bottom_section = arr1[-overlap:, :]
-            # Get top 'overlap' rows from img2
-            top_section = arr2[:overlap, :]
-
-            # Calculate difference (mean squared error)
-            diff = np.mean((bottom_section.astype(float) - top_section.astype(float)) ** 2)
-            scores.append((overlap, diff))
+        # Score every overlap amount at once (mean squared error);
+        # scores[i] is the score of an overlap of lo + i rows
+        lo, hi = 10, min(max_overlap, arr1.shape[0], arr2.shape[0])
+        if hi > lo:
+            scores = ImageStitcher._overlap_mse(arr1, arr2, lo, hi)
+        else:
+            scores = np.empty(0)
 
         # Find the LARGEST overlap with a good score (< 2000)
         # We prefer larger overlaps over slightly better scores at small overlaps
-        for overlap, score in reversed(scores):
-            if score < 2000:  # Good enough match
-                best_overlap = overlap
-                best_score = score
-                break
-
         # If no good match found, use the absolute best score
-        if best_overlap == 0:
-            for overlap, score in scores:
-                if score < best_score:
-                    best_score = score
-                    best_overlap = overlap
+        if scores.size:
+            good = np.flatnonzero(scores < 2000)  # Good enough matches
+            best = int(good[-1]) if good.size else int(np.argmin(scores))
+            best_overlap = lo + best
+            best_score = float(scores[best])
+        else:
+            best_overlap = 0
+            best_score = float('inf')
 
         # If best score is too high, probably no real overlap
         # Threshold: 100 = very similar, 1000 = somewhat similar, 10000+ = different
@@ -98,10 +122,10 @@ class ImageStitcher:
             return 0
 
         # Additional checks to avoid false positives from blank/white space matching
-        if len(scores) > 5:
-            # Calculate statistics
-            score_values = [s[1] for s in scores]
-            median_score = sorted(score_values)[len(score_values) // 2]
+        if scores.size > 5:
+            # Calculate statistics; quickselect finds the median without a full sort
+            middle = scores.size // 2
+            median_score = np.partition(scores, middle)[middle]
 
             # Check: If best score is close to median, no clear overlap pattern
             # This means all overlap amounts match about the same (no distinctive overlap)
@@ -123,8 +147,11 @@ class ImageStitcher:
             bottom_section = arr1[-best_overlap:, :]
             top_section = arr2[:best_overlap, :]
 
-            bottom_variance = np.var(bottom_section)
-            top_variance = np.var(top_section)
+            # meanStdDev is one SIMD pass; np.var makes two plus temporaries.
+            # Flatten the channels so it gives np.var's variance over all
+            # values rather than one per channel.
+            bottom_variance = cv2.meanStdDev(bottom_section.reshape(best_overlap, -1))[1][0, 0] ** 2
+            top_variance = cv2.meanStdDev(top_section.reshape(best_overlap, -1))[1][0, 0] ** 2
 
             # If variance is extremely low (< 10), it's likely solid color/blank
             if bottom_variance < 10 and top_variance < 10:
@@ -139,28 +166,129 @@ class ImageStitcher:
         return best_overlap
 
     @staticmethod
-    def _fallback_vertical_merge(images: List[Image.Image]) -> Image.Image:
+    def _overlap_mse(arr1: np.ndarray, arr2: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        """
+        Mean squared error between the bottom `overlap` rows of arr1 and the
+        top `overlap` rows of arr2, for every overlap in [lo, hi)
+
+        Uses SSD = sum(a^2) + sum(b^2) - 2*sum(a*b) over the overlapping rows.
+        The squared terms are prefix sums of per-row energy; the cross terms
+        for all overlaps come from a single cv2.matchTemplate call.
+        """
+        import cv2
+
+        h1, h2 = arr1.shape[0], arr2.shape[0]
+        arr1 = arr1.reshape(h1, -1)
+        arr2 = arr2.reshape(h2, -1)
+        row_size = arr1.shape[1]
+
+        # Slide all of arr2 down arr1 padded with h2 zero rows. At offset
+        # k = h1 - ov only the first ov rows of arr2 meet non-zero rows, so
+        # cross[k] is exactly the cross term of an overlap of ov rows.
+        # MSE doesn't change when both images shift by the same constant;
+        # centring on 128 keeps the float32 correlation sums small. arr1 is
+        # centred straight into the padded buffer, with no temporary copy.
+        padded = np.zeros((h1 + h2, row_size), dtype=np.float32)
+        a = padded[:h1]
+        np.subtract(arr1, 128, out=a, dtype=np.float32)
+        b = np.subtract(arr2, 128, dtype=np.float32)
+        cross = cv2.matchTemplate(padded, b, cv2.TM_CCORR)[:, 0].astype(np.float64)
+
+        # Energy of the bottom k rows of arr1 and the top k rows of arr2.
+        # The squares are integers, so float64 accumulation is exact.
+        rows1 = np.einsum('ij,ij->i', a, a, dtype=np.float64)
+        rows2 = np.einsum('ij,ij->i', b, b, dtype=np.float64)
+        energy1 = np.concatenate(([0.0], np.cumsum(rows1[::-1])))
+        energy2 = np.concatenate(([0.0], np.cumsum(rows2)))
+
+        overlaps = np.arange(lo, hi)
+        ssd = energy1[overlaps] + energy2[overlaps] - 2 * cross[h1 - overlaps]
+        # Clamp the rounding error around perfect matches
+        return np.maximum(ssd, 0) / (overlaps * row_size)
+
+    @staticmethod
+    def _fallback_vertical_merge(images: Iterable[Frame], sizes: List[Tuple[int, int]] = None) -> Frame:
         """
         Simple vertical merge - stack images one below the other.
         User is responsible for capturing without duplication.
+
+        With sizes given, images is only iterated once, so it can stream.
         """
-        if len(images) == 1:
-            return images[0]
+        if sizes is None:
+            images = list(images)
+            sizes = [_frame_size(img) for img in images]
+
+        if len(sizes) == 1:
+            return next(iter(images))
 
         print("Merging images vertically (simple stack)...", file=sys.stderr)
 
         # Calculate total height and max width
-        total_height = sum(img.height for img in images)
-        max_width = max(img.width for img in images)
+        total_height = sum(h for w, h in sizes)
+        max_width = max(w for w, h in sizes)
 
-        # Create merged image
-        merged = Image.new('RGB', (max_width, total_height), '#ffffff')
+        # The images fill the canvas top to bottom, so only the white strip
+        # beside narrower ones needs painting
+        canvas = np.empty((total_height, max_width, 3), dtype=np.uint8)
 
-        # Paste each image below the previous
+        # Copy each image below the previous, one slice write per image
         y_offset = 0
+        arrays = False
         for i, img in enumerate(images):
-            print(f"  Placing image {i+1}/{len(images)} at y={y_offset}", file=sys.stderr)
-            merged.paste(img, (0, y_offset))
-            y_offset += img.height
+            print(f"  Placing image {i+1}/{len(sizes)} at y={y_offset}", file=sys.stderr)
+            if isinstance(img, np.ndarray):
+                arrays = True
+                pixels = img[:, :, :3]  # Drop a grab's alpha/padding byte
+            else:
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                pixels = np.asarray(img)
+            h, w = pixels.shape[:2]
+            canvas[y_offset:y_offset + h, :w] = pixels
+            canvas[y_offset:y_offset + h, w:] = 255
+            y_offset += h
+
+        return canvas if arrays else Image.fromarray(canvas)
 
-        return merged
+    @staticmethod
+    def write_vertical_png(images: Iterable[Image.Image], sizes: List[Tuple[int, int]], filepath: str, compress_level: int = 1) -> None:
+        """
+        Stack images vertically like _fallback_vertical_merge, streaming the
+        result straight into a PNG file instead of building it in memory
+
+        Each image's rows are deflated as soon as the image arrives, so peak
+        memory is one source image rather than the whole stitch. images may
+        be a generator.
+        """
+        total_height = sum(h for w, h in sizes)
+        max_width = max(w for w, h in sizes)
+
+        def chunk(f, tag, data=b''):
+            f.write(struct.pack('>I', len(data)))
+            f.write(tag)
+            f.write(data)
+            f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag))))
+
+        print("Merging images vertically (streamed to PNG)...", file=sys.stderr)
+        with open(filepath, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n')
+            # 8-bit RGB, deflate, no interlacing
+            chunk(f, b'IHDR', struct.pack('>IIBBBBB', max_width, total_height, 8, 2, 0, 0, 0))
+
+            deflate = zlib.compressobj(compress_level)
+            row_size = 1 + max_width * 3  # Filter type byte + pixels
+            for i, img in enumerate(images):
+                print(f"  Writing image {i+1}/{len(sizes)}", file=sys.stderr)
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                w, h = img.size
+                rows = np.empty((h, row_size), dtype=np.uint8)
+                rows[:, 0] = 0  # No filter
+                rows[:, 1:1 + w * 3] = np.asarray(img).reshape(h, w * 3)
+                rows[:, 1 + w * 3:] = 255  # White beside narrower images
+                del img
+                data = deflate.compress(rows)
+                if data:
+                    chunk(f, b'IDAT', data)
+            chunk(f, b'IDAT', deflate.flush())
+            chunk(f, b'IEND')
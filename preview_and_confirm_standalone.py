@@ -11,7 +11,15 @@ from PIL import Image, ImageTk
 class PreviewWindow:
     """Show preview of merged image with recapture option"""
 
-    def __init__(self, image_path, description, capture_count):
+    def __init__(self, image_path, description, capture_count, pil_image=None):
+        """
+        Args:
+            image_path: Saved capture file
+            description: Capture description for the title
+            capture_count: Number of regions in the capture
+            pil_image: The capture already in memory, if the caller has it;
+                saves decoding the file that was just written
+        """
         self.image_path = image_path
         self.description = description
         self.capture_count = capture_count
@@ -22,7 +30,7 @@ class PreviewWindow:
 
         # Load and display image
         try:
-            img = Image.open(image_path)
+            img = pil_image if pil_image is not None else Image.open(image_path)
 
             # Resize if too large (max 1200x800)
             max_width = 1200
@@ -32,7 +40,9 @@ class PreviewWindow:
                 ratio = min(max_width / img.width, max_height / img.height)
                 new_width = int(img.width * ratio)
                 new_height = int(img.height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # Bilinear is several times faster than LANCZOS on a large
+                # downscale and plenty for an on-screen preview
+                img = img.resize((new_width, new_height), Image.Resampling.BILINEAR)
 
             self.photo = ImageTk.PhotoImage(img)
 
@@ -17,8 +17,9 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
-from enhanced_capture_standalone import DescriptionDialog, MultiCaptureOverlay, merge_and_save
-from preview_and_confirm_standalone import PreviewWindow
+# Tk-based modules are imported only when interactive selection is needed,
+# so scripted captures (--regions-file) skip Tcl/Tk start-up entirely
+from capture import merge_and_save
 
 def main():
     parser = argparse.ArgumentParser(
@@ -38,6 +39,9 @@ Examples:
   # Show preview and allow recapture
   python screencatch.py --preview
 
+  # Scripted capture of known regions (no overlay)
+  python screencatch.py --regions-file regions.json --description "Login page"
+
 Controls during capture:
   Enter           - Capture region and continue to next
   Shift+Enter     - Capture region and finish
@@ -58,10 +62,21 @@ Controls during capture:
         help='Skip description dialog'
     )
 
+    parser.add_argument(
+        '--description', '-d',
+        help='Description text (skips the description dialog)'
+    )
+
+    parser.add_argument(
+        '--regions-file',
+        help='JSON file of regions to capture, skipping the selection overlay'
+    )
+
     parser.add_argument(
         '--preview',
         action='store_true',
-        help='Show preview after capture and allow recapture'
+        help='Show preview after capture and allow recapture (with --format jpg '
+             'it shows the capture before JPEG compression)'
     )
 
     parser.add_argument(
@@ -78,6 +93,19 @@ Controls during capture:
         help='Spacing between merged images in pixels (default: 10)'
     )
 
+    parser.add_argument(
+        '--format',
+        choices=['png', 'jpg'],
+        default='png',
+        help='Image format for saved captures (default: png)'
+    )
+
+    parser.add_argument(
+        '--optimize-png',
+        action='store_true',
+        help='Recompress saved PNGs with oxipng in the background (smaller files)'
+    )
+
     parser.add_argument(
         '--json-output',
         action='store_true',
@@ -86,15 +114,19 @@ Controls during capture:
 
     args = parser.parse_args()
 
+    if args.regions_file and args.preview:
+        parser.error('--preview cannot be used with --regions-file')
+
     # Ensure output directory exists
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        description = None
+        description = args.description
 
         # Get description if requested
-        if not args.no_description:
+        if description is None and not args.no_description and not args.regions_file:
+            from enhanced_capture_standalone import DescriptionDialog
             dialog = DescriptionDialog()
             description = dialog.get_description()
 
@@ -106,20 +138,32 @@ Controls during capture:
         while True:
             print(f"\nStarting capture session{f' (recapture #{recapture_count + 1})' if recapture_count > 0 else ''}...", file=sys.stderr)
 
-            # Show capture overlay
-            temp_output = output_dir / f"temp-capture-{datetime.now().timestamp()}.json"
-            overlay = MultiCaptureOverlay(str(temp_output))
-            overlay.run()
+            if args.regions_file:
+                # Regions are already known - no overlay needed
+                with open(args.regions_file, 'rb') as f:
+                    result = json.load(f)
 
-            # Read results
-            if not temp_output.exists():
-                print("Capture cancelled - no output file created", file=sys.stderr)
-                sys.exit(1)
+                # Accept either overlay output or a bare list of regions
+                if isinstance(result, list):
+                    result = {'captures': result}
+                result['count'] = len(result['captures'])
+            else:
+                from enhanced_capture_standalone import MultiCaptureOverlay
+
+                # Show capture overlay
+                temp_output = output_dir / f"temp-capture-{datetime.now().timestamp()}.json"
+                overlay = MultiCaptureOverlay(str(temp_output))
+                overlay.run()
+
+                # Read results
+                if not temp_output.exists():
+                    print("Capture cancelled - no output file created", file=sys.stderr)
+                    sys.exit(1)
 
-            with open(temp_output, 'r') as f:
-                result = json.load(f)
+                with open(temp_output, 'rb') as f:
+                    result = json.load(f)
 
-            temp_output.unlink()
+                temp_output.unlink()
 
             if result.get('cancelled') or result.get('count', 0) == 0:
                 print("Capture cancelled by user", file=sys.stderr)
@@ -128,14 +172,19 @@ Controls during capture:
             # Merge and save captures
             print(f"\nProcessing {result['count']} captured region(s)...", file=sys.stderr)
 
-            filepath, metadata = merge_and_save(
+            # Only keep the image in memory when the preview will show it
+            filepath, metadata, *image = merge_and_save(
                 regions=result['captures'],
                 output_dir=str(output_dir),
                 description=description,
                 merge_method=args.merge_method,
                 spacing=args.spacing,
-                recapture_iteration=recapture_count
+                recapture_iteration=recapture_count,
+                image_format=args.format,
+                optimize_png=args.optimize_png,
+                return_image=args.preview
             )
+            metadata_file = os.path.splitext(filepath)[0] + '.json'
 
             print(f"✓ Saved to: {filepath}", file=sys.stderr)
             if result['count'] > 1:
@@ -143,7 +192,8 @@ Controls during capture:
 
             # Show preview if requested
             if args.preview:
-                preview = PreviewWindow(filepath, description or "Untitled", result['count'])
+                from preview_and_confirm_standalone import PreviewWindow
+                preview = PreviewWindow(filepath, description or "Untitled", result['count'], pil_image=image[0])
                 should_recapture = preview.show()
 
                 if should_recapture:
@@ -152,7 +202,7 @@ Controls during capture:
                     # Delete the file and loop
                     try:
                         os.unlink(filepath)
-                        os.unlink(filepath.replace('.png', '.json'))
+                        os.unlink(metadata_file)
                     except:
                         pass
                     continue
@@ -165,7 +215,7 @@ Controls during capture:
                 'capture_count': result['count'],
                 'merged': result['count'] > 1,
                 'recapture_iterations': recapture_count,
-                'metadata_file': filepath.replace('.png', '.json')
+                'metadata_file': metadata_file
             }
 
             if args.json_output:
@@ -9,15 +9,42 @@ import json
 import os
 from pathlib import Path
 from datetime import datetime
-from PIL import ImageGrab
+import numpy as np
 import tkinter as tk
 from tkinter import simpledialog
 
+# Read once at import by the ctypes-only capture module
+from capture import VIRTUAL_X_MIN, VIRTUAL_Y_MIN, VIRTUAL_WIDTH, VIRTUAL_HEIGHT
+
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
+# mss grabs straight into a BGRA buffer that numpy and OpenCV use as is
+try:
+    import mss  # pip install mss
+except ImportError:
+    mss = None
+
+
+def grab_region(sct, bbox):
+    """
+    Grab bbox (left, top, right, bottom) as an H x W x 3 BGR array
+
+    The capture stays in OpenCV's channel order from grab to encode, so
+    it is never converted to a PIL image and back.
+    """
+    if sct is None:
+        from PIL import ImageGrab
+        return np.asarray(ImageGrab.grab(bbox=bbox))[:, :, ::-1]
+
+    x1, y1, x2, y2 = bbox
+    shot = sct.grab({'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1})
+    # A view of the BGRA bytes without the padding byte; no copy
+    return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)[:, :, :3]
+
+
 class SimpleCaptureOverlay:
     """Simple overlay for capturing ONE region"""
 
@@ -25,19 +52,12 @@ class SimpleCaptureOverlay:
         self.region = None
         self.cancelled = False
 
-        # Multi-monitor support
-        import ctypes
-        user32 = ctypes.windll.user32
-        virtual_x_min = user32.GetSystemMetrics(76)
-        virtual_y_min = user32.GetSystemMetrics(77)
-        virtual_width = user32.GetSystemMetrics(78)
-        virtual_height = user32.GetSystemMetrics(79)
-
         self.root = tk.Tk()
         self.root.attributes('-alpha', 0.3)
         self.root.attributes('-fullscreen', True)
         self.root.attributes('-topmost', True)
-        self.root.geometry(f"{virtual_width}x{virtual_height}+{virtual_x_min}+{virtual_y_min}")
+        # Multi-monitor support
+        self.root.geometry(f"{VIRTUAL_WIDTH}x{VIRTUAL_HEIGHT}+{VIRTUAL_X_MIN}+{VIRTUAL_Y_MIN}")
 
         self.canvas = tk.Canvas(self.root, cursor='cross', bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
@@ -100,6 +120,13 @@ def main():
     print("SIMPLE STITCHING CAPTURE")
     print("="*60)
 
+    # Saving needs OpenCV; find out now rather than after the captures
+    try:
+        import cv2
+    except ImportError:
+        print("OpenCV is required to save captures: pip install opencv-python")
+        return
+
     # Get description
     root = tk.Tk()
     root.withdraw()
@@ -111,7 +138,8 @@ def main():
     root.destroy()
 
     output_dir = os.getcwd()
-    captured_images = []
+    captured_images = []  # BGR arrays
+    sct = mss.mss() if mss is not None else None
 
     print(f"\nDescription: {description or 'None'}")
     print("="*60)
@@ -147,33 +175,36 @@ def main():
                 region['x'] + region['width'],
                 region['y'] + region['height']
             )
-            img = ImageGrab.grab(bbox=bbox)
+            img = grab_region(sct, bbox)
             captured_images.append(img)
             print(f"✓ Captured region {len(captured_images)}: {region['width']}x{region['height']}")
         else:
             print("Capture cancelled")
 
+    if sct is not None:
+        sct.close()
+
     # Stitch images
     print(f"\nProcessing {len(captured_images)} capture(s)...")
 
     from image_stitcher import ImageStitcher
 
     timestamp = datetime.now()
-    year = timestamp.year
-    month = str(timestamp.month).zfill(2)
-    day = str(timestamp.day).zfill(2)
-    hours = str(timestamp.hour).zfill(2)
-    minutes = str(timestamp.minute).zfill(2)
-    seconds = str(timestamp.second).zfill(2)
-    filename = f"capture_{year}-{month}-{day}_{hours}{minutes}{seconds}.png"
+    filename = f"capture_{timestamp:%Y-%m-%d_%H%M%S}.png"
     filepath = os.path.join(output_dir, filename)
 
     if len(captured_images) == 1:
-        captured_images[0].save(filepath)
+        output = captured_images[0]
     else:
         print("Stitching images together by finding overlapping content...")
-        stitched = ImageStitcher.stitch_images(captured_images)
-        stitched.save(filepath)
+        output = ImageStitcher.stitch_images(captured_images)
+
+    # Encode in memory and write from Python: cv2.imwrite can't open
+    # non-ASCII paths on Windows and only reports that by returning False
+    ok, png = cv2.imencode('.png', output)
+    if not ok:
+        raise RuntimeError(f"Could not encode {filepath}")
+    Path(filepath).write_bytes(png)
 
     # Save metadata
     metadata = {
@@ -6,45 +6,90 @@ Quick test of standalone screencatch functionality
 
 import sys
 import os
+import importlib
 from pathlib import Path
 
-# Set UTF-8 encoding for Windows console
-if sys.platform == 'win32':
+# Set UTF-8 encoding for Windows console, unless it already is (e.g. with
+# PYTHONIOENCODING or -X utf8), so stdout isn't rewrapped for nothing
+if sys.platform == 'win32' and sys.stdout.encoding.lower() not in ('utf-8', 'utf8'):
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Imported once for the tests below; if any of these fail, test_imports
+# reports which one and main() stops before the names are used
+try:
+    import numpy as np
+    from PIL import Image
+    from image_merger import ImageMerger
+    from enhanced_capture_standalone import DescriptionDialog
+
+    # Solid-colour sample tiles for test_image_merger, filled once
+    _RED = np.full((100, 100, 3), (255, 0, 0), np.uint8)
+    _BLUE = np.full((100, 100, 3), (0, 0, 255), np.uint8)
+    _GREEN = np.full((100, 100, 3), (0, 128, 0), np.uint8)  # PIL's 'green'
+
+    # Sample images for test_image_merger, built once at import
+    _FIXTURES = [Image.fromarray(tile) for tile in (_RED, _BLUE, _GREEN)]
+except ImportError:
+    pass
+
+def _import(module_name, *names):
+    """importlib equivalent of 'from module_name import names'"""
+    module = importlib.import_module(module_name)
+    for name in names:
+        if not hasattr(module, name):
+            raise ImportError(f"cannot import name '{name}' from '{module_name}'")
+    return module
+
 def test_imports():
     """Test that all required modules can be imported"""
     print("Testing imports...")
 
     try:
-        from enhanced_capture_standalone import DescriptionDialog, MultiCaptureOverlay, merge_and_save
+        importlib.import_module('numpy')
+        print("✓ numpy imported")
+    except ImportError as e:
+        print(f"✗ Failed to import numpy: {e}")
+        print("  Install with: pip install numpy")
+        return False
+
+    try:
+        _import('enhanced_capture_standalone', 'DescriptionDialog', 'MultiCaptureOverlay', 'merge_and_save')
         print("✓ enhanced_capture_standalone imported")
     except ImportError as e:
         print(f"✗ Failed to import enhanced_capture_standalone: {e}")
         return False
 
     try:
-        from preview_and_confirm_standalone import PreviewWindow
+        _import('preview_and_confirm_standalone', 'PreviewWindow')
         print("✓ preview_and_confirm_standalone imported")
     except ImportError as e:
         print(f"✗ Failed to import preview_and_confirm_standalone: {e}")
         return False
 
     try:
-        from image_merger import ImageMerger
+        _import('image_merger', 'ImageMerger')
         print("✓ image_merger imported")
     except ImportError as e:
         print(f"✗ Failed to import image_merger: {e}")
         return False
 
     try:
-        from PIL import Image, ImageGrab
+        PIL = importlib.import_module('PIL')
+        importlib.import_module('PIL.Image')
+        importlib.import_module('PIL.ImageGrab')
         print("✓ PIL/Pillow imported")
     except ImportError as e:
         print(f"✗ Failed to import PIL: {e}")
-        print("  Install with: pip install pillow")
+        print("  Install with: pip install pillow-simd  (or: pip install pillow)")
         return False
 
+    # Pillow-SIMD releases carry a .postN suffix on the Pillow version
+    if 'post' in PIL.__version__:
+        print(f"✓ Pillow-SIMD {PIL.__version__} in use")
+    else:
+        print(f"  Pillow {PIL.__version__}; for SIMD resize/convert kernels:")
+        print("  pip uninstall pillow && pip install pillow-simd")
+
     return True
 
 def test_description_dialog():
@@ -52,8 +97,6 @@ def test_description_dialog():
     print("\nTesting description dialog...")
     print("A dialog should appear. Enter some text or cancel.")
 
-    from enhanced_capture_standalone import DescriptionDialog
-
     dialog = DescriptionDialog()
     description = dialog.get_description()
 
@@ -68,23 +111,33 @@ def test_image_merger():
     """Test image merging with sample images"""
     print("\nTesting image merger...")
 
-    from PIL import Image
-    from image_merger import ImageMerger
-
-    # Create sample images
-    img1 = Image.new('RGB', (100, 100), 'red')
-    img2 = Image.new('RGB', (100, 100), 'blue')
-    img3 = Image.new('RGB', (100, 100), 'green')
+    img1, img2, img3 = _FIXTURES
 
     try:
-        # Test vertical merge
+        # Test vertical merge: tiles at y = 0, 110, 220 with white 10 px bands
         merged = ImageMerger.merge_vertical([img1, img2, img3])
-        assert merged.size == (100, 320), f"Expected (100, 320), got {merged.size}"
+        if merged.size != (100, 320):
+            raise AssertionError(f"Expected (100, 320), got {merged.size}")
+        pixels = np.asarray(merged)
+        for y, tile in ((0, _RED), (110, _BLUE), (220, _GREEN)):
+            if not np.array_equal(pixels[y:y + 100], tile):
+                raise AssertionError(f"Wrong pixels in the tile at y={y}")
+        for y in (100, 210):
+            if not (pixels[y:y + 10] == 255).all():
+                raise AssertionError(f"Spacing band at y={y} is not background")
         print("✓ Vertical merge works")
 
-        # Test horizontal merge
+        # Test horizontal merge: same layout along x
         merged = ImageMerger.merge_horizontal([img1, img2, img3])
-        assert merged.size == (320, 100), f"Expected (320, 100), got {merged.size}"
+        if merged.size != (320, 100):
+            raise AssertionError(f"Expected (320, 100), got {merged.size}")
+        pixels = np.asarray(merged)
+        for x, tile in ((0, _RED), (110, _BLUE), (220, _GREEN)):
+            if not np.array_equal(pixels[:, x:x + 100], tile):
+                raise AssertionError(f"Wrong pixels in the tile at x={x}")
+        for x in (100, 210):
+            if not (pixels[:, x:x + 10] == 255).all():
+                raise AssertionError(f"Spacing band at x={x} is not background")
         print("✓ Horizontal merge works")
 
         # Test grid merge